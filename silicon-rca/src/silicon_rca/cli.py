@@ -10,10 +10,13 @@ from rich.table import Table
 
 from silicon_rca.ingest import load_fleet_data
 from silicon_rca.correlate import correlate_logs_to_counters
-from silicon_rca.detect import detect_incidents
+from silicon_rca.detect import DETECTORS, detect_incidents, get_detector
+from silicon_rca.evaluate import benchmark_baselines, benchmark_detectors
 from silicon_rca.rca import run_rca
-from silicon_rca.report import write_markdown_report
-from silicon_rca.plots import write_all_plots
+from silicon_rca.rollup import detect_incidents_coarse_to_fine, load_rollup, update_rollups
+from silicon_rca.report import write_store_report
+from silicon_rca.plots import write_store_plots
+from silicon_rca.store import STORE_FILE, IncidentStore, incident_id_columns
 
 app = typer.Typer(add_completion=False)
 console = Console()
@@ -31,12 +34,13 @@ def _print_top_incidents(inc: pd.DataFrame, n: int = 8) -> None:
         return
 
     top = inc.sort_values("severity_score", ascending=False).head(n)
+    id_cols = incident_id_columns(top)
     t = Table(title=f"Top {min(n, len(top))} Incidents")
-    for col in ["incident_id", "host", "workload", "event_hint", "severity_score", "top_signals"]:
+    for col in id_cols + ["host", "workload", "event_hint", "severity_score", "top_signals"]:
         t.add_column(col)
     for _, r in top.iterrows():
         t.add_row(
-            str(r["incident_id"]),
+            *[str(r[c]) for c in id_cols],
             str(r["host"]),
             str(r["workload"]),
             str(r["event_hint"]),
@@ -53,8 +57,16 @@ def run(
     window_sec: int = typer.Option(5, help="Time-bucket window for log↔counter correlation"),
     min_points: int = typer.Option(8, help="Minimum points in an incident window"),
     max_gap_sec: int = typer.Option(10, help="Max allowed gap (sec) inside an incident window"),
+    coarse_to_fine: bool = typer.Option(False, help="Scan 1min rollups first; run full-resolution detection on candidate spans only"),
+    detector: str = typer.Option("mad", help=f"Detector backend: {' | '.join(DETECTORS)}"),
+    n_jobs: int = typer.Option(-1, help="Parallel jobs for multivariate detector fitting"),
+    refit_models: bool = typer.Option(False, help="Retrain multivariate models instead of reusing out/models/"),
+    store: Path = typer.Option(None, help="Incident store (SQLite) to append to; default <out>/incidents.db"),
 ):
-    """Run end-to-end pipeline: ingest → correlate → detect → RCA → report → plots."""
+    """Run end-to-end pipeline: ingest → correlate → detect → RCA → store → report → plots."""
+    if detector not in DETECTORS:
+        raise typer.BadParameter(f"must be one of {', '.join(DETECTORS)}, got {detector!r}", param_hint="--detector")
+
     t0 = time.time()
     out.mkdir(parents=True, exist_ok=True)
 
@@ -64,7 +76,16 @@ def run(
     counters, logs = load_fleet_data(data)
     df = correlate_logs_to_counters(counters, logs, window_sec=window_sec)
 
-    inc = detect_incidents(df, min_points=min_points, max_gap_sec=max_gap_sec)
+    det = get_detector(detector) if detector == "mad" else get_detector(
+        detector, n_jobs=n_jobs, cache_dir=out / "models", refit=refit_models
+    )
+    if coarse_to_fine:
+        update_rollups(data, counters=counters, resolutions=["1min"])
+        inc = detect_incidents_coarse_to_fine(
+            df, load_rollup(data, "1min"), min_points=min_points, max_gap_sec=max_gap_sec, detector=det
+        )
+    else:
+        inc = detect_incidents(df, min_points=min_points, max_gap_sec=max_gap_sec, detector=det)
     inc_path = out / "incidents.csv"
     inc.to_csv(inc_path, index=False)
 
@@ -72,12 +93,17 @@ def run(
     rca_path = out / "rca_results.csv"
     rca.to_csv(rca_path, index=False)
 
-    report_path = write_markdown_report(out, inc, rca)
-    plot_paths = write_all_plots(out, inc, rca)
+    db = IncidentStore(store or out / STORE_FILE)
+    # Resolved, so every spelling of the same folder is one source for latest-run queries
+    run_id = db.append(inc, rca, source=str(data.resolve()))
+
+    report_path = write_store_report(out, db, run_id=run_id)
+    plot_paths = write_store_plots(out, db, run_id=run_id) if len(inc) else []
 
     console.print("[green]Artifacts written:[/green]")
     console.print(f" - {inc_path}")
     console.print(f" - {rca_path}")
+    console.print(f" - {db.path} (run {run_id})")
     console.print(f" - {report_path}")
     for p in plot_paths:
         console.print(f" - {p}")
@@ -87,6 +113,108 @@ def run(
     console.print(f"\n[bold green]Done[/bold green] in {time.time() - t0:.2f}s")
 
 
+@app.command()
+def rollup(
+    data: Path = typer.Option(Path("data/demo_fleet"), help="Input folder with counters.csv"),
+):
+    """Build or incrementally update per-host 1min/1h rollups next to the raw data."""
+    t0 = time.time()
+    paths = update_rollups(data)
+    console.print("[green]Rollups written:[/green]")
+    for p in paths:
+        console.print(f" - {p}")
+    console.print(f"\n[bold green]Done[/bold green] in {time.time() - t0:.2f}s")
+
+
+@app.command()
+def bench(
+    data: Path = typer.Option(Path("data/demo_fleet"), help="Input folder with counters.csv and logs.jsonl"),
+    window_sec: int = typer.Option(5, help="Time-bucket window for log↔counter correlation"),
+    min_points: int = typer.Option(8, help="Minimum points in an incident window"),
+    max_gap_sec: int = typer.Option(10, help="Max allowed gap (sec) inside an incident window"),
+    n_jobs: int = typer.Option(-1, help="Parallel jobs for multivariate detector fitting"),
+    baselines: bool = typer.Option(False, help="Compare baseline segmentation modes instead of detector backends"),
+):
+    """Benchmark detector backends (or baseline modes) against logged events."""
+    counters, logs = load_fleet_data(data)
+    df = correlate_logs_to_counters(counters, logs, window_sec=window_sec)
+    if baselines:
+        res = benchmark_baselines(df, min_points=min_points, max_gap_sec=max_gap_sec)
+        title = "Baseline benchmark"
+    else:
+        res = benchmark_detectors(df, min_points=min_points, max_gap_sec=max_gap_sec, n_jobs=n_jobs)
+        title = "Detector benchmark"
+
+    t = Table(title=f"{title} ({len(df)} rows)")
+    for col in res.columns:
+        t.add_column(col)
+    for _, r in res.iterrows():
+        t.add_row(*[f"{v:.2f}" if isinstance(v, float) else str(v) for v in r.tolist()])
+    console.print(t)
+
+
+@app.command()
+def simulate(
+    out: Path = typer.Option(Path("data/demo_fleet"), help="Output folder for counters.csv and logs.jsonl"),
+    workload_changes: int = typer.Option(0, help="Mid-run workload phases injected per host"),
+    seed: int = typer.Option(42, help="Random seed"),
+):
+    """Generate a simulated fleet (optionally with mid-run workload changes)."""
+    from silicon_rca.simulate import simulate as run_simulation
+
+    run_simulation(out_dir=out, workload_changes=workload_changes, seed=seed)
+
+
+@app.command()
+def query(
+    store: Path = typer.Option(Path("out") / STORE_FILE, help="Incident store (SQLite)"),
+    host: str = typer.Option(None, help="Filter by host"),
+    workload: str = typer.Option(None, help="Filter by workload"),
+    root_cause: str = typer.Option(None, help="Filter by root cause"),
+    since: str = typer.Option(None, help="Incidents starting at/after this timestamp"),
+    until: str = typer.Option(None, help="Incidents starting before this timestamp"),
+    run_id: str = typer.Option(None, help="Filter by pipeline run"),
+    all_runs: bool = typer.Option(False, help="Include every stored run, not only the latest run per source"),
+    min_severity: float = typer.Option(None, help="Minimum severity_score"),
+    limit: int = typer.Option(20, help="Max incidents to print"),
+    report: Path = typer.Option(None, help="Also write report.md + plots for the filtered incidents into this folder"),
+):
+    """Query the incident store with indexed filters."""
+    if not store.exists():
+        console.print(f"[red]No incident store at {store}[/red]")
+        raise typer.Exit(1)
+
+    for value, hint in ((since, "--since"), (until, "--until")):
+        if value is None:
+            continue
+        try:
+            pd.Timestamp(value)
+        except ValueError as e:
+            raise typer.BadParameter(f"not a timestamp: {value!r} ({e})", param_hint=hint)
+
+    db = IncidentStore(store)
+    filters = dict(
+        host=host,
+        workload=workload,
+        root_cause=root_cause,
+        since=since,
+        until=until,
+        run_id=run_id,
+        min_severity=min_severity,
+        latest=run_id is None and not all_runs,
+    )
+    total = db.count(**filters)
+    inc = db.query(limit=limit, **filters)
+    console.print(f"[bold]{total}[/bold] matching incidents")
+    _print_top_incidents(inc, n=limit)
+
+    if report is not None and total > 0:
+        console.print("[green]Artifacts written:[/green]")
+        console.print(f" - {write_store_report(report, db, **filters)}")
+        for p in write_store_plots(report, db, **filters):
+            console.print(f" - {p}")
+
+
 def main():
     app()
 
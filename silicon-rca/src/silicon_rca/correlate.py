@@ -1,5 +1,7 @@
 import pandas as pd
 
+from silicon_rca.events import NONE
+
 
 def correlate_logs_to_counters(
     counters: pd.DataFrame,
@@ -24,7 +26,8 @@ def correlate_logs_to_counters(
         suffixes=("", "_log"),
     )
 
-    merged["event"] = merged["event"].fillna("NONE")
-    merged["severity"] = merged["severity"].fillna("NONE")
+    # event/severity stay dictionary-encoded categoricals when logs come from load_logs
+    merged["event"] = merged["event"].fillna(NONE)
+    merged["severity"] = merged["severity"].fillna(NONE)
 
     return merged.drop(columns=["ts_bucket"])
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Tuple
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, asdict, fields
+from typing import List, Dict, Optional, Tuple
 import pandas as pd
 import numpy as np
 
+from silicon_rca.events import NONE
+
 
 METRICS = [
     "mem_latency_p99",
@@ -37,27 +40,10 @@ class Incident:
         return d
 
 
-def _robust_zscore(s: pd.Series) -> pd.Series:
-    """
-    Robust z-score using median and MAD.
-    z = 0.6745*(x - median)/MAD
-    """
-    med = s.median()
-    mad = (s - med).abs().median()
-    if mad == 0:
-        return pd.Series([0.0] * len(s), index=s.index)
-    return 0.6745 * (s - med) / mad
-
-
-def _build_anomaly_mask(dfh: pd.DataFrame) -> pd.DataFrame:
+def _mad_rules(z: pd.DataFrame) -> pd.Series:
     """
-    Compute robust z-score per metric per host and return a boolean mask dataframe.
+    Per-metric MAD thresholds on robust z-scores (columns named by metric).
     """
-    z = pd.DataFrame(index=dfh.index)
-    for m in METRICS:
-        if m not in dfh.columns:
-            continue
-        z[m] = _robust_zscore(dfh[m].astype(float))
     # Rules: we treat high latency, ECC, PCIe, net drops, temp, mem_bw as "high-bad"
     # and freq as "low-bad" (throttling).
     high_bad = (
@@ -69,9 +55,209 @@ def _build_anomaly_mask(dfh: pd.DataFrame) -> pd.DataFrame:
         | (z["mem_bw"] > 4.0)
     )
     low_bad = (z["freq_ghz"] < -4.0)
+    return (high_bad | low_bad).fillna(False)
+
+
+class Detector(ABC):
+    """
+    Detector backend interface used by detect_incidents.
+
+    Backends see the robust z-scores of every row (columns named by metric,
+    already normalized per host) plus the row's workload, and return a boolean
+    anomaly flag per row. Incident windowing and attribution stay in
+    detect_incidents, so every backend yields the same incident schema.
+    Backends that learn from the data set `trainable = True`; for the others
+    fit is a no-op and fit_detector skips scoring the frame.
+    """
+
+    name = "base"
+    trainable = False
+
+    def fit(self, z: pd.DataFrame, workload: pd.Series) -> "Detector":
+        return self
+
+    @abstractmethod
+    def predict(self, z: pd.DataFrame, workload: pd.Series) -> pd.Series:
+        ...
+
+
+class MADDetector(Detector):
+    """
+    Default backend: fixed per-metric MAD thresholds (see _mad_rules).
+    """
+
+    name = "mad"
+
+    def predict(self, z: pd.DataFrame, workload: pd.Series) -> pd.Series:
+        return _mad_rules(z)
+
+
+# Backend names accepted by get_detector
+DETECTORS = ("mad", "iforest", "mahalanobis")
+
+
+def get_detector(name: str, **kwargs) -> Detector:
+    """
+    Resolve a backend by name: "mad" (default), "iforest" or "mahalanobis".
+    """
+    if name == "mad":
+        return MADDetector()
+    if name in ("iforest", "mahalanobis"):
+        from silicon_rca.multivariate import MultivariateDetector
+
+        return MultivariateDetector(method=name, **kwargs)
+    raise ValueError(f"Unknown detector backend: {name}")
+
+
+# Segments with fewer unique samples than this borrow a broader baseline: a
+# failure lasting a few minutes would otherwise become half of its own baseline.
+MIN_SEGMENT_SAMPLES = 600
+
+
+def _change_point_ids(
+    df: pd.DataFrame,
+    window_sec: int = 600,
+    z_thresh: float = 3.0,
+    min_segment_samples: int = MIN_SEGMENT_SAMPLES,
+) -> pd.Series:
+    """
+    Level-shift segmentation per host, linear in the number of rows.
+    The series is cut into window_sec blocks; a change point is placed at a
+    block boundary when any metric's block median moves by more than
+    z_thresh robust units (scale = median within-block MAD of the host).
+    Blocks are long compared to incident windows, so an incident barely moves
+    its block median and is not absorbed into a segment of its own. Change
+    points that would leave a segment with fewer than min_segment_samples
+    unique samples (e.g. a partial edge block) are dropped.
+    Returns a per-row change-point segment number (restarts at 0 per host).
+    """
+    metrics = [m for m in METRICS if m in df.columns]
+    # Correlation can repeat a counter sample once per matching log line
+    pts = df.drop_duplicates(["host", "timestamp"])
+    block = pts["timestamp"].dt.floor(f"{window_sec}s")
+    vals = pts[metrics].astype(float)
+
+    keys = [pts["host"], block]
+    block_med = vals.groupby(keys).median()
+    dev = (vals - vals.groupby(keys).transform("median")).abs()
+    scale = dev.groupby(keys).median().groupby(level=0).median()
+
+    shift = block_med.groupby(level=0).diff().abs()
+    scale = scale.reindex(shift.index.get_level_values(0)).set_axis(shift.index)
+    z = 0.6745 * shift / scale.where(scale > 0)
+    is_cp = (z > z_thresh).any(axis=1)
+    is_cp = _enforce_min_segment(is_cp, vals.groupby(keys).size(), min_segment_samples)
+    cp_num = is_cp.astype(int).groupby(level=0).cumsum()
+
+    row_keys = pd.MultiIndex.from_arrays([df["host"], df["timestamp"].dt.floor(f"{window_sec}s")])
+    return pd.Series(cp_num.reindex(row_keys).to_numpy(), index=df.index)
+
+
+def _enforce_min_segment(is_cp: pd.Series, sizes: pd.Series, min_samples: int) -> pd.Series:
+    """
+    Drop change points so every segment has >= min_samples (a host shorter
+    than that keeps a single segment). One pass over the blocks of each host.
+    """
+    out = is_cp.copy()
+    for host in is_cp.index.get_level_values(0).unique():
+        flags = is_cp.loc[host].to_numpy().copy()
+        n = sizes.loc[host].to_numpy()
+        flags[0] = False
+        seg_start, seg_n = 0, 0
+        for i in range(len(flags)):
+            if flags[i] and seg_n < min_samples:
+                flags[i] = False  # current segment too small: keep extending it
+            if flags[i]:
+                seg_start, seg_n = i, 0
+            seg_n += n[i]
+        if seg_n < min_samples and seg_start > 0:
+            flags[seg_start] = False  # merge a short tail into the previous segment
+        out.loc[host] = flags
+    return out
+
 
-    mask = pd.DataFrame(index=dfh.index)
-    mask["is_anomaly"] = (high_bad | low_bad).fillna(False)
+def _segment_ids(
+    df: pd.DataFrame,
+    by_workload: bool = True,
+    change_points: bool = False,
+    cp_window_sec: int = 600,
+    min_segment_samples: int = MIN_SEGMENT_SAMPLES,
+) -> pd.Series:
+    """
+    Integer baseline segment per row: host, optionally x workload, optionally
+    x change-point segment. Segments never span hosts.
+    """
+    keys = [df["host"]]
+    if by_workload and "workload" in df.columns:
+        keys.append(df["workload"])
+    if change_points:
+        keys.append(_change_point_ids(df, window_sec=cp_window_sec, min_segment_samples=min_segment_samples))
+    return df.groupby(keys, sort=False).ngroup()
+
+
+def _build_anomaly_mask(
+    df: pd.DataFrame,
+    segments: pd.Series,
+    baseline: Optional[pd.DataFrame] = None,
+    fallbacks: Optional[List[pd.Series]] = None,
+    min_segment_samples: int = MIN_SEGMENT_SAMPLES,
+) -> pd.DataFrame:
+    """
+    Robust z-score per metric against the median/MAD of each row's segment
+    (vectorized over all hosts with grouped transforms), plus the MAD-rule mask.
+    Rows whose segment has fewer than min_segment_samples unique samples use
+    the first of `fallbacks` (broader groupings, e.g. workload across the fleet,
+    then host) whose group is large enough.
+    `baseline` ("<metric>_median"/"<metric>_mad" columns, indexed by host or by
+    (host, workload)) overrides the computed statistics where it has a row.
+    """
+    metrics = [m for m in METRICS if m in df.columns]
+    vals = df[metrics].astype(float)
+
+    # Correlation repeats a counter sample once per matching log line; fit the
+    # statistics on unique samples so a logged failure cannot outweigh the
+    # normal rows of a short segment.
+    uniq = ~df.duplicated(["host", "timestamp"]).to_numpy()
+    vu = vals[uniq]
+
+    def grouped_stats(groups: pd.Series):
+        gu = groups[uniq].to_numpy()
+        g_med = vu.groupby(gu).median()
+        g_mad = (vu - g_med.reindex(gu).to_numpy()).abs().groupby(gu).median()
+        size = pd.Series(gu).value_counts().reindex(groups.to_numpy()).to_numpy()
+        return (
+            g_med.reindex(groups.to_numpy()).set_axis(df.index),
+            g_mad.reindex(groups.to_numpy()).set_axis(df.index),
+            size,
+        )
+
+    med, mad, size = grouped_stats(segments)
+    small = size < min_segment_samples
+    for groups in fallbacks or []:
+        if not small.any():
+            break
+        f_med, f_mad, f_size = grouped_stats(groups)
+        use = small & (f_size >= min_segment_samples)
+        med.loc[use] = f_med.loc[use]
+        mad.loc[use] = f_mad.loc[use]
+        small &= ~use
+
+    if baseline is not None:
+        names = [n for n in baseline.index.names]
+        keys = pd.MultiIndex.from_arrays([df[n] for n in names]) if len(names) > 1 else df[names[0]]
+        b = baseline.reindex(keys)
+        for m in metrics:
+            if f"{m}_median" not in b.columns:
+                continue
+            has = b[f"{m}_median"].notna().to_numpy()
+            med.loc[has, m] = b[f"{m}_median"].to_numpy()[has]
+            mad.loc[has, m] = b[f"{m}_mad"].to_numpy()[has]
+
+    # z = 0.6745*(x - median)/MAD, and 0 where the segment MAD is 0
+    z = (0.6745 * (vals - med) / mad.where(mad > 0)).where(mad > 0, 0.0)
+
+    mask = pd.DataFrame(index=df.index)
+    mask["is_anomaly"] = _mad_rules(z)
     # Keep z-scores for later attribution
     for m in z.columns:
         mask[f"z_{m}"] = z[m]
@@ -99,26 +285,97 @@ def _coalesce_windows(timestamps: List[pd.Timestamp], max_gap_sec: int) -> List[
     return windows
 
 
+def _scored_frame(
+    df: pd.DataFrame,
+    baseline: Optional[pd.DataFrame] = None,
+    by_workload: bool = True,
+    change_points: bool = False,
+) -> pd.DataFrame:
+    """
+    Sorted copy of `df` with is_anomaly (MAD rules) and z_<metric> columns joined.
+    """
+    df = df.copy()
+    df["timestamp"] = pd.to_datetime(df["timestamp"])
+    df.sort_values(["host", "timestamp"], inplace=True)
+    if len(df) > 0:
+        segments = _segment_ids(df, by_workload=by_workload, change_points=change_points)
+        # Short segments: same workload pooled across the fleet, then the whole host
+        fallbacks = [df["host"]]
+        if by_workload and "workload" in df.columns:
+            fallbacks.insert(0, df["workload"])
+        df = df.join(_build_anomaly_mask(df, segments, baseline=baseline, fallbacks=fallbacks))
+    return df
+
+
+def _detector_inputs(df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Series]:
+    z = df[[f"z_{m}" for m in METRICS if f"z_{m}" in df.columns]]
+    z = z.rename(columns=lambda c: c[2:])
+    workload = df["workload"] if "workload" in df.columns else pd.Series("unknown", index=df.index)
+    return z, workload
+
+
+def fit_detector(
+    df: pd.DataFrame,
+    detector: Detector,
+    baseline: Optional[pd.DataFrame] = None,
+    by_workload: bool = True,
+    change_points: bool = False,
+) -> Detector:
+    """
+    Fit `detector` on the robust z-scores of all of `df`. Use it with
+    detect_incidents(..., prefitted=True) when detection only runs on a slice
+    (e.g. coarse-to-fine candidate spans, which are mostly anomalous).
+    Detectors without trainable state are returned as-is.
+    """
+    if not detector.trainable:
+        return detector
+    scored = _scored_frame(df, baseline=baseline, by_workload=by_workload, change_points=change_points)
+    if len(scored) > 0:
+        detector.fit(*_detector_inputs(scored))
+    return detector
+
+
 def detect_incidents(
     df: pd.DataFrame,
     min_points: int = 10,
     max_gap_sec: int = 10,
+    baseline: Optional[pd.DataFrame] = None,
+    detector: Optional[Detector] = None,
+    by_workload: bool = True,
+    change_points: bool = False,
+    prefitted: bool = False,
 ) -> pd.DataFrame:
     """
     Detect incident windows per host using robust z-score + window coalescing.
     Returns a dataframe of incidents (one row per incident).
+
+    `detector` picks which rows are anomalous (default: MADDetector). It is
+    fitted and scored once over all hosts, in bulk; with `prefitted` the fit
+    step is skipped (see fit_detector).
+
+    Robust statistics are computed per host and workload (`by_workload`), so
+    a host switching e.g. idle -> ai_train is not scored against a baseline
+    that mixes both. `change_points` further splits each host's series at
+    detected level shifts (see _change_point_ids). Segments shorter than
+    MIN_SEGMENT_SAMPLES fall back to the workload's fleet-wide statistics,
+    then to the host-wide ones.
+
+    `baseline` (indexed by host or (host, workload), "<metric>_median"/"<metric>_mad"
+    columns) replaces the median/MAD computed from `df`; use it when `df` only
+    holds a slice of each host's series (see rollup.detect_incidents_coarse_to_fine).
     """
-    df = df.copy()
-    df["timestamp"] = pd.to_datetime(df["timestamp"])
-    df.sort_values(["host", "timestamp"], inplace=True)
+    df = _scored_frame(df, baseline=baseline, by_workload=by_workload, change_points=change_points)
 
     incidents: List[Incident] = []
     inc_counter = 0
 
-    for host, dfh in df.groupby("host", sort=False):
-        mask = _build_anomaly_mask(dfh)
-        dfh = dfh.join(mask)
+    if detector is not None and len(df) > 0:
+        z, workload = _detector_inputs(df)
+        if not prefitted:
+            detector.fit(z, workload)
+        df["is_anomaly"] = detector.predict(z, workload).to_numpy()
 
+    for host, dfh in df.groupby("host", sort=False):
         anomalous = dfh[dfh["is_anomaly"]]
         ts_list = anomalous["timestamp"].tolist()
 
@@ -150,10 +407,10 @@ def detect_incidents(
                 top.append(f"{k}:{sign}{abs(v):.1f}")
             top_signals = ",".join(top)
                         # Event hint (dominant non-NONE if present)
-            event_hint = "NONE"
-            non_none = window_df[window_df["event"] != "NONE"]["event"]
+            event_hint = NONE
+            non_none = window_df[window_df["event"] != NONE]["event"]
             if len(non_none) > 0:
-                event_hint = non_none.value_counts().idxmax()
+                event_hint = str(non_none.value_counts().idxmax())
 
             # Severity score = sum of abs(top 3) (cap)
             severity = float(
@@ -195,4 +452,7 @@ def detect_incidents(
             )
             inc_counter += 1
 
-    return pd.DataFrame([i.to_dict() for i in incidents]).sort_values(["severity_score"], ascending=False)
+    columns = [f.name for f in fields(Incident)]
+    return pd.DataFrame([i.to_dict() for i in incidents], columns=columns).sort_values(
+        ["severity_score"], ascending=False
+    )
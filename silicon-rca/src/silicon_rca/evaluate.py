@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import time
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from silicon_rca.detect import detect_incidents, get_detector
+from silicon_rca.events import NONE
+
+
+def point_labels(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per (host, timestamp); label = a silicon event was logged nearby.
+    """
+    pts = df[["host", "timestamp", "event"]].copy()
+    pts["timestamp"] = pd.to_datetime(pts["timestamp"])
+    pts["label"] = pts["event"] != NONE
+    return pts.groupby(["host", "timestamp"], as_index=False)["label"].max()
+
+
+def point_predictions(pts: pd.DataFrame, incidents: pd.DataFrame) -> np.ndarray:
+    pred = np.zeros(len(pts), dtype=bool)
+    for _, inc in incidents.iterrows():
+        pred |= (
+            (pts["host"] == inc["host"])
+            & (pts["timestamp"] >= pd.Timestamp(inc["start_ts"]))
+            & (pts["timestamp"] <= pd.Timestamp(inc["end_ts"]))
+        ).to_numpy()
+    return pred
+
+
+def point_scores(pts: pd.DataFrame, incidents: pd.DataFrame) -> Dict[str, float]:
+    """
+    Point-level precision/recall of incident windows against `pts` labels.
+    """
+    pred = point_predictions(pts, incidents)
+    label = pts["label"].to_numpy()
+    tp = int((pred & label).sum())
+    return {
+        "precision": tp / pred.sum() if pred.sum() else 0.0,
+        "recall": tp / label.sum() if label.sum() else 0.0,
+    }
+
+
+def spurious_mask(df: pd.DataFrame, incidents: pd.DataFrame) -> pd.Series:
+    """
+    True for incidents whose window contains no logged silicon event on that host.
+    """
+    events = df.loc[df["event"] != NONE, ["host", "timestamp"]].copy()
+    events["timestamp"] = pd.to_datetime(events["timestamp"])
+    by_host = {h: g["timestamp"].to_numpy() for h, g in events.groupby("host")}
+
+    out = []
+    for _, inc in incidents.iterrows():
+        ts = by_host.get(inc["host"], np.array([], dtype="datetime64[ns]"))
+        start, end = pd.Timestamp(inc["start_ts"]), pd.Timestamp(inc["end_ts"])
+        out.append(not ((ts >= start) & (ts <= end)).any())
+    return pd.Series(out, index=incidents.index, dtype=bool)
+
+
+# Baseline segmentation modes compared by benchmark_baselines
+BASELINE_MODES = {
+    "host": dict(by_workload=False, change_points=False),
+    "host+workload": dict(by_workload=True, change_points=False),
+    "host+workload+changepoints": dict(by_workload=True, change_points=True),
+}
+
+
+def benchmark_baselines(
+    df: pd.DataFrame,
+    min_points: int = 10,
+    max_gap_sec: int = 10,
+) -> pd.DataFrame:
+    """
+    Compare baseline segmentation modes on a correlated dataframe:
+    incidents, spurious incidents (no logged event inside the window),
+    point-level precision/recall and wall time.
+    """
+    pts = point_labels(df)
+    rows = []
+    for mode, kwargs in BASELINE_MODES.items():
+        t0 = time.perf_counter()
+        inc = detect_incidents(df, min_points=min_points, max_gap_sec=max_gap_sec, **kwargs)
+        elapsed = time.perf_counter() - t0
+
+        rows.append({
+            "baseline": mode,
+            "seconds": elapsed,
+            "incidents": len(inc),
+            "spurious": int(spurious_mask(df, inc).sum()),
+            **point_scores(pts, inc),
+        })
+    return pd.DataFrame(rows)
+
+
+def benchmark_detectors(
+    df: pd.DataFrame,
+    names: Iterable[str] = ("mad", "iforest", "mahalanobis"),
+    min_points: int = 10,
+    max_gap_sec: int = 10,
+    n_jobs: int = -1,
+) -> pd.DataFrame:
+    """
+    Compare backends on a correlated dataframe: wall time, throughput
+    (rows/sec through detect_incidents, model fit included) and point-level
+    precision/recall against rows with a logged silicon event.
+    """
+    pts = point_labels(df)
+    rows = []
+    for name in names:
+        kwargs = {} if name == "mad" else {"n_jobs": n_jobs}
+        t0 = time.perf_counter()
+        inc = detect_incidents(
+            df,
+            min_points=min_points,
+            max_gap_sec=max_gap_sec,
+            detector=get_detector(name, **kwargs),
+        )
+        elapsed = time.perf_counter() - t0
+
+        rows.append({
+            "detector": name,
+            "seconds": elapsed,
+            "rows_per_sec": len(df) / elapsed if elapsed > 0 else float("inf"),
+            "incidents": len(inc),
+            **point_scores(pts, inc),
+        })
+    return pd.DataFrame(rows)
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import re
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+
+# Canonical silicon event vocabulary. Order is the dictionary encoding:
+# the position of a name is its integer code in the categorical columns.
+NONE = "NONE"
+UNKNOWN = "UNKNOWN"
+DRAM_ECC = "DRAM_ECC"
+PCIE_AER = "PCIE_AER"
+THERMAL = "THERMAL"
+NETWORK_CONGESTION = "NETWORK_CONGESTION"
+
+EVENT_TYPES: List[str] = [NONE, UNKNOWN, DRAM_ECC, PCIE_AER, THERMAL, NETWORK_CONGESTION]
+SEVERITIES: List[str] = [NONE, UNKNOWN, "INFO", "WARN", "ERROR", "CRITICAL"]
+
+EVENT_DTYPE = pd.CategoricalDtype(EVENT_TYPES)
+SEVERITY_DTYPE = pd.CategoricalDtype(SEVERITIES)
+
+# Raw spellings seen in fleet logs -> canonical name (keys are already normalized)
+EVENT_ALIASES: Dict[str, str] = {
+    "ECC": DRAM_ECC,
+    "DRAM_CE": DRAM_ECC,
+    "DRAM_ECC_CE": DRAM_ECC,
+    "MEM_ECC": DRAM_ECC,
+    "MCE": DRAM_ECC,
+    "AER": PCIE_AER,
+    "PCIE": PCIE_AER,
+    "PCIE_ERROR": PCIE_AER,
+    "THERMAL_THROTTLE": THERMAL,
+    "THROTTLE": THERMAL,
+    "OVERTEMP": THERMAL,
+    "NET_DROPS": NETWORK_CONGESTION,
+    "NET_CONGESTION": NETWORK_CONGESTION,
+    "CONGESTION": NETWORK_CONGESTION,
+}
+
+SEVERITY_ALIASES: Dict[str, str] = {
+    "WARNING": "WARN",
+    "ERR": "ERROR",
+    "CRIT": "CRITICAL",
+    "FATAL": "CRITICAL",
+    "NOTICE": "INFO",
+}
+
+
+def _canonical(raw: object, vocab: List[str], aliases: Dict[str, str]) -> str:
+    """
+    "pcie-aer " -> "PCIE_AER"; anything outside the vocabulary -> UNKNOWN.
+    """
+    if not isinstance(raw, str):
+        return UNKNOWN
+    key = re.sub(r"[\s\-./]+", "_", raw.strip().upper())
+    key = aliases.get(key, key)
+    return key if key in vocab else UNKNOWN
+
+
+def _encode(values: pd.Series, dtype: pd.CategoricalDtype, aliases: Dict[str, str]) -> pd.Series:
+    """
+    Map raw strings to a dictionary-encoded categorical.
+    Only the distinct raw values go through _canonical, so cost is one
+    factorize pass plus a vocabulary lookup per unique string.
+    """
+    vocab = list(dtype.categories)
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    lookup = np.array(
+        [vocab.index(_canonical(u, vocab, aliases)) for u in uniques] + [vocab.index(UNKNOWN)],
+        dtype=np.int8,
+    )
+    # factorize marks missing values with -1, which indexes the trailing UNKNOWN
+    cat = pd.Categorical.from_codes(lookup[codes], dtype=dtype)
+    return pd.Series(cat, index=values.index, name=values.name)
+
+
+def normalize_events(values: pd.Series) -> pd.Series:
+    return _encode(values, EVENT_DTYPE, EVENT_ALIASES)
+
+
+def normalize_severities(values: pd.Series) -> pd.Series:
+    return _encode(values, SEVERITY_DTYPE, SEVERITY_ALIASES)
@@ -1,7 +1,19 @@
 from pathlib import Path
+from itertools import islice
+from typing import Dict, List
 import json
 import pandas as pd
 
+from silicon_rca.events import normalize_events, normalize_severities
+
+try:
+    import orjson
+except ImportError:  # optional fast JSON backend
+    orjson = None
+
+
+LOG_FIELDS = ["timestamp", "host", "event", "severity"]
+
 
 def load_counters(path: Path) -> pd.DataFrame:
     df = pd.read_csv(path, parse_dates=["timestamp"])
@@ -9,13 +21,39 @@ def load_counters(path: Path) -> pd.DataFrame:
     return df
 
 
-def load_logs(path: Path) -> pd.DataFrame:
-    records = []
-    with open(path) as f:
-        for line in f:
-            records.append(json.loads(line))
-    df = pd.DataFrame(records)
+def _read_json_array(lines: List[bytes]):
+    """
+    Parse a chunk of JSONL lines in one call by joining them into a JSON array.
+    """
+    payload = b"[" + b",".join(lines) + b"]"
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def load_logs(path: Path, chunk_lines: int = 200_000) -> pd.DataFrame:
+    """
+    Bulk JSONL ingest: chunks of lines are parsed with a single loads call
+    (orjson when installed), only LOG_FIELDS are kept, and event/severity
+    are mapped to the canonical dictionary-encoded vocabulary (see events.py).
+    """
+    columns: Dict[str, list] = {k: [] for k in LOG_FIELDS}
+    with open(path, "rb") as f:
+        while True:
+            chunk = list(islice(f, chunk_lines))
+            if not chunk:
+                break
+            lines = [ln for ln in chunk if ln.strip()]
+            if not lines:
+                continue
+            for rec in _read_json_array(lines):
+                for k in LOG_FIELDS:
+                    columns[k].append(rec.get(k))
+
+    df = pd.DataFrame(columns)
     df["timestamp"] = pd.to_datetime(df["timestamp"])
+    df["event"] = normalize_events(df["event"])
+    df["severity"] = normalize_severities(df["severity"])
     df.sort_values(["host", "timestamp"], inplace=True)
     return df
 
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import joblib
+import pandas as pd
+from sklearn.covariance import EllipticEnvelope
+from sklearn.ensemble import IsolationForest
+
+from silicon_rca.detect import Detector, _mad_rules
+
+
+# Fitted models shared by every MultivariateDetector in the process,
+# keyed by method + params + workload.
+_MODEL_CACHE: Dict[str, Tuple[List[str], object]] = {}
+
+
+def _fit_model(method: str, X: pd.DataFrame, contamination: float, random_state: int, n_jobs: int):
+    """
+    Fit one workload model on the informative (non-constant) z columns.
+    """
+    cols = [c for c in X.columns if X[c].std() > 0]
+    if method == "iforest":
+        model = IsolationForest(
+            n_estimators=100,
+            contamination=contamination,
+            random_state=random_state,
+            n_jobs=n_jobs,
+        )
+    else:
+        # Robust covariance -> Mahalanobis distance with an MCD-estimated center
+        model = EllipticEnvelope(contamination=contamination, random_state=random_state)
+    model.fit(X[cols].to_numpy())
+    return cols, model
+
+
+class MultivariateDetector(Detector):
+    """
+    Joint-signal backend: one model per workload over the per-host robust z-scores.
+
+    Scoring the z-vector instead of each metric separately catches combinations
+    that no single-metric threshold trips (slight freq drop + slight temp rise).
+    Models are fitted per workload in parallel (n_jobs) and cached, in memory
+    and optionally on disk under `cache_dir`, keyed by method, parameters and
+    workload: a trained model is reused to score later batches, one file per
+    workload. Pass `refit=True` to retrain and overwrite the cached models.
+    Workloads with fewer than `min_train_rows` rows fall back to the MAD rules.
+    """
+
+    trainable = True
+
+    def __init__(
+        self,
+        method: str = "iforest",
+        contamination: float = 0.02,
+        n_jobs: int = -1,
+        random_state: int = 0,
+        max_train_rows: int = 10000,
+        min_train_rows: int = 200,
+        cache_dir: Optional[Path] = None,
+        refit: bool = False,
+    ):
+        if method not in ("iforest", "mahalanobis"):
+            raise ValueError(f"Unknown multivariate method: {method}")
+        self.name = method
+        self.method = method
+        self.contamination = contamination
+        self.n_jobs = n_jobs
+        self.random_state = random_state
+        self.max_train_rows = max_train_rows
+        self.min_train_rows = min_train_rows
+        self.cache_dir = cache_dir
+        self.refit = refit
+        self.models: Dict[str, Tuple[List[str], object]] = {}
+
+    def _cache_key(self, workload: str) -> str:
+        return f"{self.method}-{self.contamination}-{self.random_state}-{self.max_train_rows}-{workload}"
+
+    def _cache_get(self, key: str):
+        if self.refit:
+            return None
+        if key in _MODEL_CACHE:
+            return _MODEL_CACHE[key]
+        if self.cache_dir is not None:
+            path = Path(self.cache_dir) / f"{key}.joblib"
+            if path.exists():
+                _MODEL_CACHE[key] = joblib.load(path)
+                return _MODEL_CACHE[key]
+        return None
+
+    def _cache_put(self, key: str, entry: Tuple[List[str], object]) -> None:
+        _MODEL_CACHE[key] = entry
+        if self.cache_dir is not None:
+            Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+            joblib.dump(entry, Path(self.cache_dir) / f"{key}.joblib")
+
+    def fit(self, z: pd.DataFrame, workload: pd.Series) -> "MultivariateDetector":
+        z = z.fillna(0.0)
+        pending: Dict[str, Tuple[str, pd.DataFrame]] = {}
+        for wl, zw in z.groupby(workload.to_numpy(), sort=True):
+            key = self._cache_key(wl)
+            cached = self._cache_get(key)
+            if cached is not None:
+                self.models[wl] = cached
+                continue
+            if len(zw) < self.min_train_rows:
+                continue
+            if len(zw) > self.max_train_rows:
+                zw = zw.sample(self.max_train_rows, random_state=self.random_state)
+            pending[wl] = (key, zw)
+
+        # Parallelize across workloads; each model then runs single-threaded
+        fitted = joblib.Parallel(n_jobs=self.n_jobs)(
+            joblib.delayed(_fit_model)(self.method, zw, self.contamination, self.random_state, 1)
+            for _, zw in pending.values()
+        )
+        for (wl, (key, _)), entry in zip(pending.items(), fitted):
+            self._cache_put(key, entry)
+            self.models[wl] = entry
+        return self
+
+    def predict(self, z: pd.DataFrame, workload: pd.Series) -> pd.Series:
+        z = z.fillna(0.0)
+        out = _mad_rules(z).copy()
+        wl_values = workload.to_numpy()
+        for wl, (cols, model) in self.models.items():
+            rows = wl_values == wl
+            if rows.any():
+                out.loc[rows] = model.predict(z.loc[rows, cols].to_numpy()) == -1
+        return out
+
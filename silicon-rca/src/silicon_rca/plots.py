@@ -4,6 +4,8 @@ from pathlib import Path
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from silicon_rca.store import IncidentStore
+
 
 def plot_severity_hist(out_dir: Path, incidents: pd.DataFrame) -> Path:
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -21,10 +23,13 @@ def plot_severity_hist(out_dir: Path, incidents: pd.DataFrame) -> Path:
 
 
 def plot_root_cause_bar(out_dir: Path, rca: pd.DataFrame) -> Path:
+    return _plot_root_cause_counts(out_dir, rca["root_cause"].value_counts())
+
+
+def _plot_root_cause_counts(out_dir: Path, counts: pd.Series) -> Path:
     out_dir.mkdir(parents=True, exist_ok=True)
     p = out_dir / "root_cause_counts.png"
 
-    counts = rca["root_cause"].value_counts()
     plt.figure()
     counts.plot(kind="bar")
     plt.title("Root Cause Counts")
@@ -40,3 +45,13 @@ def write_all_plots(out_dir: Path, incidents: pd.DataFrame, rca: pd.DataFrame):
     p1 = plot_severity_hist(out_dir, incidents)
     p2 = plot_root_cause_bar(out_dir, rca)
     return [p1, p2]
+
+
+def write_store_plots(out_dir: Path, store: IncidentStore, **filters):
+    """
+    Plots from store queries: only severity scores and grouped root-cause counts are read.
+    """
+    p1 = plot_severity_hist(out_dir, store.query(columns=["severity_score"], **filters))
+    counts = store.root_cause_counts(**filters).set_index("root_cause")["count"]
+    p2 = _plot_root_cause_counts(out_dir, counts)
+    return [p1, p2]
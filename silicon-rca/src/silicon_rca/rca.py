@@ -4,6 +4,8 @@ from dataclasses import dataclass, asdict
 from typing import Dict, List, Tuple
 import pandas as pd
 
+from silicon_rca.events import DRAM_ECC, NETWORK_CONGESTION, NONE, PCIE_AER, THERMAL
+
 
 @dataclass
 class RCAResult:
@@ -47,7 +49,7 @@ def rank_root_cause(incident_row: pd.Series) -> RCAResult:
     """
     incident_id = incident_row["incident_id"]
     workload = incident_row.get("workload", "unknown")
-    event_hint = incident_row.get("event_hint", "NONE")
+    event_hint = incident_row.get("event_hint", NONE)
     signals = _parse_top_signals(incident_row.get("top_signals", ""))
     rule_hits = []
 
@@ -70,9 +72,9 @@ def rank_root_cause(incident_row: pd.Series) -> RCAResult:
     score_mem += 0.5 * (lat > 4.0)
     score_mem += 0.3 * (bw > 4.0)
     score_mem += 0.2 * (workload in ["ai_train", "video_transcode"])
-    score_mem += 0.4 * (event_hint == "DRAM_ECC")
-    if event_hint == "DRAM_ECC":
-        rule_hits.append("event_hint=DRAM_ECC")
+    score_mem += 0.4 * (event_hint == DRAM_ECC)
+    if event_hint == DRAM_ECC:
+        rule_hits.append(f"event_hint={DRAM_ECC}")
     if ecc > 4.0:
         rule_hits.append("ecc_ce_high")
     if lat > 4.0:
@@ -88,9 +90,9 @@ def rank_root_cause(incident_row: pd.Series) -> RCAResult:
     score_pcie = 0.0
     score_pcie += 0.7 * (pcie > 4.0)
     score_pcie += 0.3 * (workload in ["ai_train", "video_transcode"])
-    score_pcie += 0.5 * (event_hint == "PCIE_AER")
-    if event_hint == "PCIE_AER":
-        rule_hits.append("event_hint=PCIE_AER")
+    score_pcie += 0.5 * (event_hint == PCIE_AER)
+    if event_hint == PCIE_AER:
+        rule_hits.append(f"event_hint={PCIE_AER}")
     if pcie > 4.0:
         rule_hits.append("pcie_aer_high")
 
@@ -105,9 +107,9 @@ def rank_root_cause(incident_row: pd.Series) -> RCAResult:
     score_thermal += 0.6 * (temp > 4.0)
     score_thermal += 0.6 * (freq > 4.0)  # NOTE: freq_ghz z-score is negative for low-bad, but peak abs used earlier.
     score_thermal += 0.2 * (cpu > 4.0)
-    score_thermal += 0.4 * (event_hint == "THERMAL")
-    if event_hint == "THERMAL":
-        rule_hits.append("event_hint=THERMAL")
+    score_thermal += 0.4 * (event_hint == THERMAL)
+    if event_hint == THERMAL:
+        rule_hits.append(f"event_hint={THERMAL}")
     if temp > 4.0:
         rule_hits.append("temp_high")
     if "freq_ghz" in signals and signals["freq_ghz"] < -4.0:
@@ -123,9 +125,9 @@ def rank_root_cause(incident_row: pd.Series) -> RCAResult:
     score_net = 0.0
     score_net += 0.7 * (net > 4.0)
     score_net += 0.4 * (workload == "network_burst")
-    score_net += 0.5 * (event_hint == "NETWORK_CONGESTION")
-    if event_hint == "NETWORK_CONGESTION":
-        rule_hits.append("event_hint=NETWORK_CONGESTION")
+    score_net += 0.5 * (event_hint == NETWORK_CONGESTION)
+    if event_hint == NETWORK_CONGESTION:
+        rule_hits.append(f"event_hint={NETWORK_CONGESTION}")
     if net > 4.0:
         rule_hits.append("net_drops_high")
 
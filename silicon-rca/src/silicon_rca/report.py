@@ -3,45 +3,71 @@ from __future__ import annotations
 from pathlib import Path
 import pandas as pd
 
+from silicon_rca.store import IncidentStore, incident_id_columns
 
-def write_markdown_report(
-    out_dir: Path,
-    incidents: pd.DataFrame,
-    rca: pd.DataFrame,
-) -> Path:
-    out_dir.mkdir(parents=True, exist_ok=True)
-    report_path = out_dir / "report.md"
-
-    # Summary tables
-    top_inc = incidents.sort_values("severity_score", ascending=False).head(10)
-    rc_dist = rca["root_cause"].value_counts().reset_index()
-    rc_dist.columns = ["root_cause", "count"]
 
+def _render_report(total: int, rc_dist: pd.DataFrame, top: pd.DataFrame) -> str:
+    """
+    `top` holds the top incidents by severity already joined with their RCA.
+    """
     lines = []
     lines.append("# Post-Silicon Failure RCA Report\n")
     lines.append("## Executive Summary\n")
-    lines.append(f"- Total incidents detected: **{len(incidents)}**\n")
+    lines.append(f"- Total incidents detected: **{total}**\n")
     lines.append("- Top root-cause categories:\n")
 
     for _, row in rc_dist.head(5).iterrows():
         lines.append(f"  - **{row['root_cause']}**: {int(row['count'])}\n")
 
+    id_cols = incident_id_columns(top)
+
     lines.append("\n## Top Incidents (by severity)\n")
-    lines.append(top_inc[["incident_id", "host", "workload", "event_hint", "severity_score", "top_signals"]]
+    lines.append(top[id_cols + ["host", "workload", "event_hint", "severity_score", "top_signals"]]
                  .to_markdown(index=False))
     lines.append("\n## RCA Results (Top 10)\n")
 
-    joined = pd.merge(top_inc, rca, on="incident_id", how="left")
     lines.append(
-        joined[["incident_id", "root_cause", "confidence", "explanation"]].to_markdown(index=False)
+        top[id_cols + ["root_cause", "confidence", "explanation"]].to_markdown(index=False)
     )
 
     lines.append("\n## Recommended Next Actions\n")
-    for _, row in joined.iterrows():
-        lines.append(f"### {row['incident_id']} — {row['root_cause']} (conf {row['confidence']:.2f})\n")
+    for _, row in top.iterrows():
+        label = " / ".join(str(row[c]) for c in id_cols)
+        lines.append(f"### {label} — {row['root_cause']} (conf {row['confidence']:.2f})\n")
         lines.append(f"- **Why:** {row['explanation']}\n")
         lines.append(f"- **Validation:** {row['recommended_validation']}\n")
         lines.append(f"- **Mitigation:** {row['recommended_mitigation']}\n")
 
-    report_path.write_text("\n".join(lines))
+    return "\n".join(lines)
+
+
+def write_markdown_report(
+    out_dir: Path,
+    incidents: pd.DataFrame,
+    rca: pd.DataFrame,
+) -> Path:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    report_path = out_dir / "report.md"
+
+    # Summary tables
+    top_inc = incidents.sort_values("severity_score", ascending=False).head(10)
+    rc_dist = rca["root_cause"].value_counts().reset_index()
+    rc_dist.columns = ["root_cause", "count"]
+
+    joined = pd.merge(top_inc, rca, on="incident_id", how="left")
+    report_path.write_text(_render_report(len(incidents), rc_dist, joined))
+    return report_path
+
+
+def write_store_report(out_dir: Path, store: IncidentStore, **filters) -> Path:
+    """
+    Same report, built from indexed store queries (count, GROUP BY, top-10)
+    instead of loading every incident. `filters` are IncidentStore filters.
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    report_path = out_dir / "report.md"
+
+    top = store.query(limit=10, **filters)
+    rc_dist = store.root_cause_counts(**filters)
+    report_path.write_text(_render_report(store.count(**filters), rc_dist, top))
     return report_path
@@ -0,0 +1,287 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from silicon_rca.detect import METRICS, Detector, detect_incidents, fit_detector
+from silicon_rca.ingest import load_counters
+
+
+# Resolution label -> pandas offset alias used for bucketing
+RESOLUTIONS: Dict[str, str] = {
+    "1min": "1min",
+    "1h": "1h",
+}
+
+ROLLUP_DIR = "rollups"
+KEY_COLUMNS = ["host", "workload", "bucket"]
+
+
+def rollup_path(data_dir: Path, resolution: str) -> Path:
+    """
+    Rollups live next to the raw data: <data_dir>/rollups/counters_<resolution>.csv
+    """
+    return data_dir / ROLLUP_DIR / f"counters_{resolution}.csv"
+
+
+def fingerprint_path(data_dir: Path, resolution: str) -> Path:
+    """
+    Fingerprint of the raw counters a rollup was built from, next to the rollup.
+    """
+    return data_dir / ROLLUP_DIR / f"counters_{resolution}.source.json"
+
+
+def _row_hashes(counters: pd.DataFrame) -> np.ndarray:
+    cols = ["timestamp", "host", "workload"] + [m for m in METRICS if m in counters.columns]
+    return pd.util.hash_pandas_object(counters[cols], index=False).to_numpy()
+
+
+def source_fingerprint(counters: pd.DataFrame) -> Dict[str, Dict]:
+    """
+    Per host: first/last timestamp, row count and a checksum (wrapping sum of
+    row hashes) of the raw counters. Appending rows leaves the entries valid
+    for the rows they cover; rewriting the data does not.
+    """
+    ts = pd.to_datetime(counters["timestamp"]).to_numpy()
+    hashes = _row_hashes(counters)
+    fp = {}
+    for host, idx in counters.groupby("host", sort=True).indices.items():
+        fp[str(host)] = {
+            "first_ts": str(pd.Timestamp(ts[idx].min())),
+            "last_ts": str(pd.Timestamp(ts[idx].max())),
+            "rows": int(len(idx)),
+            "checksum": int(hashes[idx].sum(dtype=np.uint64)),
+        }
+    return fp
+
+
+def fingerprint_covers(fingerprint: Optional[Dict[str, Dict]], counters: pd.DataFrame) -> bool:
+    """
+    True if `counters` still contains, unchanged, every row the fingerprint
+    was taken from (i.e. it only grew by appends since).
+    """
+    if not fingerprint:
+        return False
+    ts = pd.to_datetime(counters["timestamp"]).to_numpy()
+    hashes = _row_hashes(counters)
+    groups = counters.groupby("host", sort=False).indices
+    for host, entry in fingerprint.items():
+        idx = groups.get(host)
+        if idx is None:
+            return False
+        idx = idx[ts[idx] <= np.datetime64(pd.Timestamp(entry["last_ts"]))]
+        if (
+            len(idx) != entry["rows"]
+            or str(pd.Timestamp(ts[idx].min())) != entry["first_ts"]
+            or int(hashes[idx].sum(dtype=np.uint64)) != entry["checksum"]
+        ):
+            return False
+    return True
+
+
+def build_rollup(counters: pd.DataFrame, resolution: str = "1min") -> pd.DataFrame:
+    """
+    Aggregate raw counters into per-host/workload buckets.
+    For every metric: mean, min, max, p10, p90, p99, median, MAD and zpeak, where
+    zpeak = 0.6745*max|x - median|/MAD inside the bucket (0 if MAD is 0).
+    """
+    freq = RESOLUTIONS[resolution]
+    metrics = [m for m in METRICS if m in counters.columns]
+
+    df = counters[["timestamp", "host", "workload"] + metrics].copy()
+    df["bucket"] = pd.to_datetime(df["timestamp"]).dt.floor(freq)
+    g = df.groupby(KEY_COLUMNS, sort=True)
+
+    out = g.size().rename("n").to_frame()
+    for m in metrics:
+        x = df[m].astype(float)
+        med = g[m].transform("median")
+        dev = (x - med).abs()
+        gd = dev.groupby([df[k] for k in KEY_COLUMNS], sort=True)
+        mad = gd.median()
+        peak = gd.max()
+
+        out[f"{m}_mean"] = g[m].mean()
+        out[f"{m}_min"] = g[m].min()
+        out[f"{m}_max"] = g[m].max()
+        out[f"{m}_p10"] = g[m].quantile(0.10)
+        out[f"{m}_p90"] = g[m].quantile(0.90)
+        out[f"{m}_p99"] = g[m].quantile(0.99)
+        out[f"{m}_median"] = g[m].median()
+        out[f"{m}_mad"] = mad
+        out[f"{m}_zpeak"] = np.where(mad > 0, 0.6745 * peak / mad.where(mad > 0, 1.0), 0.0)
+
+    return out.reset_index()
+
+
+def update_rollup(
+    existing: Optional[pd.DataFrame],
+    counters: pd.DataFrame,
+    resolution: str = "1min",
+) -> pd.DataFrame:
+    """
+    Incrementally extend a rollup with new counters.
+    Per host, everything from the last stored bucket onwards is recomputed
+    (that bucket may have been partial); older buckets are kept untouched.
+    Assumes `counters` only grew by appends; update_rollups checks that
+    against the stored source fingerprint and rebuilds otherwise.
+    """
+    if existing is None or len(existing) == 0:
+        return build_rollup(counters, resolution)
+
+    watermark = existing.groupby("host")["bucket"].max()
+    ts = pd.to_datetime(counters["timestamp"]).dt.floor(RESOLUTIONS[resolution])
+    host_wm = counters["host"].map(watermark)
+    fresh = counters[host_wm.isna() | (ts >= host_wm)]
+    if len(fresh) == 0:
+        return existing
+
+    old_wm = existing["host"].map(watermark)
+    touched = existing["host"].isin(fresh["host"].unique()) & (existing["bucket"] >= old_wm)
+    merged = pd.concat([existing[~touched], build_rollup(fresh, resolution)], ignore_index=True)
+    return merged.sort_values(KEY_COLUMNS).reset_index(drop=True)
+
+
+def load_rollup(data_dir: Path, resolution: str = "1min") -> Optional[pd.DataFrame]:
+    path = rollup_path(data_dir, resolution)
+    if not path.exists():
+        return None
+    return pd.read_csv(path, parse_dates=["bucket"])
+
+
+def load_fingerprint(data_dir: Path, resolution: str = "1min") -> Optional[Dict[str, Dict]]:
+    path = fingerprint_path(data_dir, resolution)
+    if not path.exists():
+        return None
+    return json.loads(path.read_text())
+
+
+def update_rollups(
+    data_dir: Path,
+    counters: Optional[pd.DataFrame] = None,
+    resolutions: Optional[List[str]] = None,
+) -> List[Path]:
+    """
+    Build or incrementally update every rollup resolution for a data folder.
+    A rollup whose source fingerprint no longer matches the counters (raw
+    data rewritten, e.g. by `simulate`, rather than appended to) is rebuilt.
+    """
+    if counters is None:
+        counters = load_counters(data_dir / "counters.csv")
+    paths = []
+    for res in resolutions or list(RESOLUTIONS):
+        existing = load_rollup(data_dir, res)
+        if existing is not None and not fingerprint_covers(load_fingerprint(data_dir, res), counters):
+            existing = None
+        rollup = update_rollup(existing, counters, res)
+        path = rollup_path(data_dir, res)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        rollup.to_csv(path, index=False)
+        fingerprint_path(data_dir, res).write_text(json.dumps(source_fingerprint(counters), indent=1))
+        paths.append(path)
+    return paths
+
+
+def rollup_baseline(rollup: pd.DataFrame) -> pd.DataFrame:
+    """
+    Approximate per-host, per-workload median/MAD from bucket medians/MADs.
+    Indexed by (host, workload) with "<metric>_median"/"<metric>_mad" columns,
+    the shape detect_incidents(baseline=...) expects.
+    """
+    cols = [c for c in rollup.columns if c.endswith("_median") or c.endswith("_mad")]
+    return rollup.groupby(["host", "workload"])[cols].median()
+
+
+def scan_rollup(
+    rollup: pd.DataFrame,
+    baseline: Optional[pd.DataFrame] = None,
+    z_thresh: float = 3.0,
+) -> pd.DataFrame:
+    """
+    Flag rollup buckets whose tail deviates from the host baseline.
+    High-bad metrics use the bucket p90, freq_ghz (throttling) the bucket p10:
+    an incident of min_points samples leaves at least ~10% of a 1min bucket
+    beyond the detector threshold, while single noisy samples (which only
+    move min/max) do not. Returns the flagged rows of `rollup`.
+    """
+    if baseline is None:
+        baseline = rollup_baseline(rollup)
+    keys = pd.MultiIndex.from_arrays([rollup[n] for n in baseline.index.names])
+    b = baseline.reindex(keys).set_index(rollup.index)
+
+    flagged = pd.Series(False, index=rollup.index)
+    for m in METRICS:
+        if f"{m}_p90" not in rollup.columns:
+            continue
+        mad = b[f"{m}_mad"].where(b[f"{m}_mad"] > 0)
+        if m == "freq_ghz":
+            z = 0.6745 * (rollup[f"{m}_p10"] - b[f"{m}_median"]) / mad
+            flagged |= (z < -z_thresh).fillna(False)
+        else:
+            z = 0.6745 * (rollup[f"{m}_p90"] - b[f"{m}_median"]) / mad
+            flagged |= (z > z_thresh).fillna(False)
+    return rollup[flagged]
+
+
+def candidate_spans(
+    flagged: pd.DataFrame,
+    resolution: str = "1min",
+    pad_buckets: int = 1,
+) -> List[Tuple[str, pd.Timestamp, pd.Timestamp]]:
+    """
+    Merge flagged buckets into (host, start, end) spans, padded by whole buckets.
+    """
+    step = pd.Timedelta(RESOLUTIONS[resolution])
+    spans: List[Tuple[str, pd.Timestamp, pd.Timestamp]] = []
+    for host, fh in flagged.groupby("host", sort=True):
+        buckets = fh["bucket"].drop_duplicates().sort_values().tolist()
+        start = prev = buckets[0]
+        for b in buckets[1:]:
+            if b - prev <= step * (2 * pad_buckets + 1):
+                prev = b
+                continue
+            spans.append((host, start - pad_buckets * step, prev + (pad_buckets + 1) * step))
+            start = prev = b
+        spans.append((host, start - pad_buckets * step, prev + (pad_buckets + 1) * step))
+    return spans
+
+
+def detect_incidents_coarse_to_fine(
+    df: pd.DataFrame,
+    rollup: pd.DataFrame,
+    resolution: str = "1min",
+    z_thresh: float = 3.0,
+    min_points: int = 10,
+    max_gap_sec: int = 10,
+    detector: Optional[Detector] = None,
+) -> pd.DataFrame:
+    """
+    Scan the rollup first, then run full-resolution detect_incidents only on
+    the candidate spans. Robust statistics come from the rollup baseline so
+    the sliced series are scored against the whole-run host behaviour.
+    A trainable `detector` is fitted on all of `df` (the spans are mostly
+    anomalous) and only scores the spans; others never see the full frame.
+    """
+    baseline = rollup_baseline(rollup)
+    spans = candidate_spans(scan_rollup(rollup, baseline, z_thresh), resolution)
+
+    ts = pd.to_datetime(df["timestamp"])
+    keep = pd.Series(False, index=df.index)
+    for host, start, end in spans:
+        keep |= (df["host"] == host) & (ts >= start) & (ts < end)
+
+    if detector is not None:
+        fit_detector(df, detector, baseline=baseline)
+
+    return detect_incidents(
+        df[keep],
+        min_points=min_points,
+        max_gap_sec=max_gap_sec,
+        baseline=baseline,
+        detector=detector,
+        prefitted=detector is not None,
+    )
@@ -47,11 +47,25 @@ def inject_failure(row, failure):
     return row
 
 
-def simulate():
-    random.seed(SEED)
-    np.random.seed(SEED)
-
-    out_dir = Path("data/demo_fleet")
+def workload_schedule(primary, duration, changes):
+    """
+    Per-second workload labels: the primary workload, interrupted by
+    `changes` phases (120-400s each) of a different workload.
+    """
+    schedule = [primary] * duration
+    for _ in range(changes):
+        other = random.choice([w for w in WORKLOADS if w != primary])
+        start = random.randint(0, duration - 120)
+        end = min(duration, start + random.randint(120, 400))
+        schedule[start:end] = [other] * (end - start)
+    return schedule
+
+
+def simulate(out_dir=Path("data/demo_fleet"), workload_changes=0, seed=SEED):
+    random.seed(seed)
+    np.random.seed(seed)
+
+    out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
     start_time = datetime.now()
@@ -63,17 +77,18 @@ def simulate():
 
     for host in hosts:
         workload = random.choice(WORKLOADS)
-        base = base_counters(workload)
 
         failure = random.choice(FAILURE_TYPES + [None])
         failure_start = random.randint(300, 1200) if failure else None
         failure_end = failure_start + random.randint(60, 180) if failure else None
+        schedule = workload_schedule(workload, DURATION_SEC, workload_changes)
 
         for i, ts in enumerate(times):
+            base = base_counters(schedule[i])
             row = {
                 "timestamp": ts,
                 "host": host,
-                "workload": workload,
+                "workload": schedule[i],
                 "cpu_util": np.clip(np.random.normal(base["cpu"], 5), 0, 100),
                 "mem_bw": np.clip(np.random.normal(base["mem_bw"], 8), 0, 100),
                 "mem_latency_p99": np.clip(np.random.normal(base["latency"], 10), 0, 200),
@@ -101,7 +116,7 @@ def simulate():
         for e in log_events:
             f.write(json.dumps(e) + "\n")
 
-    print("Fleet telemetry generated in data/demo_fleet/")
+    print(f"Fleet telemetry generated in {out_dir}/")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+
+STORE_FILE = "incidents.db"
+
+INCIDENT_COLUMNS = [
+    "incident_id",
+    "host",
+    "workload",
+    "start_ts",
+    "end_ts",
+    "duration_sec",
+    "top_signals",
+    "event_hint",
+    "severity_score",
+]
+RCA_COLUMNS = [
+    "root_cause",
+    "confidence",
+    "explanation",
+    "evidence_top_signals",
+    "rule_hits",
+    "confidence_rationale",
+    "recommended_validation",
+    "recommended_mitigation",
+]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    source TEXT
+);
+CREATE TABLE IF NOT EXISTS incidents (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    incident_id TEXT NOT NULL,
+    host TEXT,
+    workload TEXT,
+    start_ts TEXT,
+    end_ts TEXT,
+    duration_sec INTEGER,
+    top_signals TEXT,
+    event_hint TEXT,
+    severity_score REAL,
+    root_cause TEXT,
+    confidence REAL,
+    explanation TEXT,
+    evidence_top_signals TEXT,
+    rule_hits TEXT,
+    confidence_rationale TEXT,
+    recommended_validation TEXT,
+    recommended_mitigation TEXT,
+    PRIMARY KEY (run_id, incident_id)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_source_created ON runs(source, created_at);
+CREATE INDEX IF NOT EXISTS idx_incidents_incident_id ON incidents(incident_id);
+CREATE INDEX IF NOT EXISTS idx_incidents_host_start ON incidents(host, start_ts);
+CREATE INDEX IF NOT EXISTS idx_incidents_start_ts ON incidents(start_ts);
+CREATE INDEX IF NOT EXISTS idx_incidents_root_cause ON incidents(root_cause);
+"""
+
+
+def incident_id_columns(incidents: pd.DataFrame) -> List[str]:
+    """
+    Columns that identify an incident in `incidents`. Store queries can span
+    runs, where incident_id alone is ambiguous, so run_id leads when present.
+    """
+    return ["run_id", "incident_id"] if "run_id" in incidents.columns else ["incident_id"]
+
+
+class IncidentStore:
+    """
+    Durable local incident store (SQLite), one row per incident with its RCA.
+
+    Each pipeline run is appended in a single transaction under a new run_id,
+    so readers never see a half-written run. Re-running on the same source
+    appends a new run; pass latest=True to the readers to see only the most
+    recent run of every source instead of every copy. Filters map to indexed columns
+    (incident_id, host, start_ts, root_cause); timestamps are stored as
+    "YYYY-MM-DD HH:MM:SS[.ffffff]" text so lexical order is time order.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # Commit (or roll back) the transaction, then close the connection
+        conn = sqlite3.connect(self.path)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def append(
+        self,
+        incidents: pd.DataFrame,
+        rca: pd.DataFrame,
+        run_id: Optional[str] = None,
+        source: Optional[str] = None,
+    ) -> str:
+        """
+        Atomically append one run's incidents joined with their RCA results.
+        """
+        run_id = run_id or f"{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}"
+        rows = incidents.reindex(columns=INCIDENT_COLUMNS)
+        if len(rca) > 0:
+            rows = rows.merge(rca, on="incident_id", how="left")
+        rows = rows.reindex(columns=INCIDENT_COLUMNS + RCA_COLUMNS)
+        rows["start_ts"] = rows["start_ts"].astype(str)
+        rows["end_ts"] = rows["end_ts"].astype(str)
+        rows.insert(0, "run_id", run_id)
+
+        cols = list(rows.columns)
+        # Series.tolist yields Python scalars sqlite3 can bind (NaN is stored as NULL)
+        records = list(zip(*(rows[c].tolist() for c in cols)))
+        sql = f"INSERT INTO incidents ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})"
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO runs (run_id, created_at, source) VALUES (?, ?, ?)",
+                (run_id, datetime.now().isoformat(), source),
+            )
+            conn.executemany(sql, records)
+        return run_id
+
+    @staticmethod
+    def _where(
+        run_id: Optional[str] = None,
+        incident_id: Optional[str] = None,
+        host: Optional[str] = None,
+        workload: Optional[str] = None,
+        root_cause: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        min_severity: Optional[float] = None,
+        latest: bool = False,
+    ) -> Tuple[str, List]:
+        clauses, params = [], []
+        if latest:
+            # Most recent run of each source (NULL sources compare equal via IS)
+            clauses.append(
+                "run_id IN (SELECT r.run_id FROM runs r WHERE r.created_at = "
+                "(SELECT MAX(r2.created_at) FROM runs r2 WHERE r2.source IS r.source))"
+            )
+        for col, val in (
+            ("run_id", run_id),
+            ("incident_id", incident_id),
+            ("host", host),
+            ("workload", workload),
+            ("root_cause", root_cause),
+        ):
+            if val is not None:
+                clauses.append(f"{col} = ?")
+                params.append(val)
+        if since is not None:
+            clauses.append("start_ts >= ?")
+            params.append(str(pd.Timestamp(since)))
+        if until is not None:
+            clauses.append("start_ts < ?")
+            params.append(str(pd.Timestamp(until)))
+        if min_severity is not None:
+            clauses.append("severity_score >= ?")
+            params.append(float(min_severity))
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query(
+        self,
+        columns: Optional[List[str]] = None,
+        order_by: str = "severity_score DESC",
+        limit: Optional[int] = None,
+        **filters,
+    ) -> pd.DataFrame:
+        where, params = self._where(**filters)
+        cols = ", ".join(columns) if columns else "*"
+        sql = f"SELECT {cols} FROM incidents{where} ORDER BY {order_by}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._connect() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    def count(self, **filters) -> int:
+        where, params = self._where(**filters)
+        with self._connect() as conn:
+            return int(conn.execute(f"SELECT COUNT(*) FROM incidents{where}", params).fetchone()[0])
+
+    def root_cause_counts(self, **filters) -> pd.DataFrame:
+        where, params = self._where(**filters)
+        sql = (
+            f"SELECT root_cause, COUNT(*) AS count FROM incidents{where} "
+            "GROUP BY root_cause ORDER BY count DESC, root_cause"
+        )
+        with self._connect() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
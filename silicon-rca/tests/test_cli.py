@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from silicon_rca.cli import app
+from silicon_rca.store import STORE_FILE, IncidentStore
+
+DEMO = Path(__file__).resolve().parents[1] / "data" / "demo_fleet"
+
+runner = CliRunner()
+
+
+def test_unknown_detector_is_rejected_before_loading_data(tmp_path):
+    # The data folder does not exist: a usage error proves nothing was loaded
+    result = runner.invoke(app, ["run", "--data", str(tmp_path / "missing"), "--out", str(tmp_path), "--detector", "foo"])
+    assert result.exit_code == 2
+    assert "--detector" in result.output
+
+
+def test_runs_on_the_same_folder_share_one_source(tmp_path, monkeypatch):
+    monkeypatch.chdir(DEMO.parents[1])
+    for data in ("data/demo_fleet", "./data/demo_fleet", str(DEMO)):
+        result = runner.invoke(app, ["run", "--data", data, "--out", str(tmp_path)])
+        assert result.exit_code == 0, result.output
+
+    db = IncidentStore(tmp_path / STORE_FILE)
+    assert db.count() == 3 * db.count(latest=True)
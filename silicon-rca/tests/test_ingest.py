@@ -0,0 +1,73 @@
+import json
+
+import pandas as pd
+import pytest
+
+from silicon_rca import ingest
+from silicon_rca.events import EVENT_TYPES, UNKNOWN, normalize_events, normalize_severities
+from silicon_rca.ingest import LOG_FIELDS, load_logs
+
+RECORDS = [
+    {"timestamp": "2026-01-28T17:00:02", "host": "host_01", "event": "pcie-aer ", "severity": "warning"},
+    {"timestamp": "2026-01-28T17:00:00", "host": "host_00", "event": "DRAM_ECC", "severity": "ERROR", "extra": 1},
+    {"timestamp": "2026-01-28T17:00:01", "host": "host_00", "event": None, "severity": "crit"},
+    {"timestamp": "2026-01-28T17:00:03", "host": "host_01", "severity": "bogus"},
+    {"timestamp": "2026-01-28T17:00:04", "host": "host_02", "event": "Thermal Throttle", "severity": "INFO"},
+]
+
+
+@pytest.fixture
+def logs_path(tmp_path):
+    path = tmp_path / "logs.jsonl"
+    lines = [json.dumps(r) for r in RECORDS]
+    # Blank and whitespace-only lines (incl. a whole blank chunk at chunk_lines=1)
+    lines.insert(2, "")
+    lines.insert(4, "   ")
+    path.write_text("\n".join(lines) + "\n\n")
+    return path
+
+
+def test_aliases_are_normalized():
+    events = normalize_events(pd.Series(["pcie-aer ", "ecc", "Thermal Throttle", "net.drops", "nonsense"]))
+    assert events.tolist() == ["PCIE_AER", "DRAM_ECC", "THERMAL", "NETWORK_CONGESTION", UNKNOWN]
+    severities = normalize_severities(pd.Series(["warning", " err", "Fatal", "INFO"]))
+    assert severities.tolist() == ["WARN", "ERROR", "CRITICAL", "INFO"]
+
+
+def test_missing_values_map_to_unknown():
+    events = normalize_events(pd.Series(["DRAM_ECC", None, float("nan"), 3]))
+    assert events.tolist() == ["DRAM_ECC", UNKNOWN, UNKNOWN, UNKNOWN]
+
+
+def test_categorical_codes_follow_event_types_order():
+    events = normalize_events(pd.Series(EVENT_TYPES[::-1] + ["pcie-aer"]))
+    assert list(events.cat.categories) == EVENT_TYPES
+    assert events.cat.codes.tolist() == list(range(len(EVENT_TYPES)))[::-1] + [EVENT_TYPES.index("PCIE_AER")]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_chunking_does_not_change_the_frame(logs_path, monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(ingest, "orjson", None)
+
+    whole = load_logs(logs_path)
+    assert list(whole.columns) == LOG_FIELDS  # unknown fields are dropped
+    assert len(whole) == len(RECORDS)  # blank lines are skipped
+    pd.testing.assert_frame_equal(load_logs(logs_path, chunk_lines=1), whole)
+    pd.testing.assert_frame_equal(load_logs(logs_path, chunk_lines=2), whole)
+
+    by_ts = whole.set_index("timestamp")
+    assert by_ts.loc["2026-01-28 17:00:02", "event"] == "PCIE_AER"
+    assert by_ts.loc["2026-01-28 17:00:02", "severity"] == "WARN"
+    assert by_ts.loc["2026-01-28 17:00:01", "event"] == UNKNOWN
+    assert by_ts.loc["2026-01-28 17:00:03", "event"] == UNKNOWN
+    assert by_ts.loc["2026-01-28 17:00:03", "severity"] == UNKNOWN
+
+
+def test_orjson_and_json_agree(logs_path, monkeypatch):
+    pytest.importorskip("orjson")
+    fast = load_logs(logs_path)
+    monkeypatch.setattr(ingest, "orjson", None)
+    pd.testing.assert_frame_equal(load_logs(logs_path), fast)
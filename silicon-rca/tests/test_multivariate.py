@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from silicon_rca.detect import METRICS, _mad_rules
+from silicon_rca.multivariate import _MODEL_CACHE, MultivariateDetector
+
+
+def _batch(seed: int, n: int = 600):
+    rng = np.random.default_rng(seed)
+    z = pd.DataFrame(rng.normal(size=(n, len(METRICS))), columns=METRICS)
+    workload = pd.Series(np.where(np.arange(n) % 2, "ai_train", "idle"))
+    return z, workload
+
+
+def test_persisted_models_are_reused_across_batches(tmp_path):
+    _MODEL_CACHE.clear()
+    z1, w1 = _batch(0)
+    MultivariateDetector(n_jobs=1, cache_dir=tmp_path).fit(z1, w1)
+    files = sorted(p.name for p in tmp_path.iterdir())
+    assert len(files) == 2  # one model per workload
+
+    _MODEL_CACHE.clear()
+    z2, w2 = _batch(1)
+    det = MultivariateDetector(n_jobs=1, cache_dir=tmp_path).fit(z2, w2)
+    assert sorted(p.name for p in tmp_path.iterdir()) == files
+    assert det.predict(z2, w2).dtype == bool
+
+
+def test_refit_overwrites_instead_of_adding(tmp_path):
+    _MODEL_CACHE.clear()
+    z, w = _batch(0)
+    MultivariateDetector(n_jobs=1, cache_dir=tmp_path).fit(z, w)
+    MultivariateDetector(n_jobs=1, cache_dir=tmp_path, refit=True).fit(*_batch(1))
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+@pytest.mark.parametrize("method", ["iforest", "mahalanobis"])
+def test_joint_throttling_anomaly_is_flagged(method):
+    # Under load temp tracks frequency; throttling breaks that (freq down,
+    # temp up) while every metric stays below its MAD-rule threshold.
+    _MODEL_CACHE.clear()
+    rng = np.random.default_rng(0)
+    z = pd.DataFrame(rng.normal(size=(2000, len(METRICS))), columns=METRICS)
+    z["temp_c"] = 0.9 * z["freq_ghz"] + 0.3 * rng.normal(size=len(z))
+    workload = pd.Series("ai_train", index=z.index)
+
+    probe = pd.DataFrame(0.0, index=[0], columns=METRICS)
+    probe[["freq_ghz", "temp_c", "mem_latency_p99", "cpu_util"]] = [-3.0, 3.0, 3.0, -3.0]
+    probe_wl = pd.Series("ai_train", index=probe.index)
+
+    assert not _mad_rules(probe).any()
+    det = MultivariateDetector(method=method, n_jobs=1).fit(z, workload)
+    assert det.predict(probe, probe_wl).all()
+    assert det.predict(z, workload).mean() < 0.05
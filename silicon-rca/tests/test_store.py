@@ -0,0 +1,49 @@
+import pandas as pd
+
+from silicon_rca.store import IncidentStore
+
+
+def _incidents(n: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "incident_id": [f"INC_{i:04d}" for i in range(n)],
+        "host": [f"host_{i:02d}" for i in range(n)],
+        "workload": "ai_train",
+        "start_ts": [pd.Timestamp("2026-01-28 17:00:00") + pd.Timedelta(minutes=i) for i in range(n)],
+        "end_ts": [pd.Timestamp("2026-01-28 17:00:30") + pd.Timedelta(minutes=i) for i in range(n)],
+        "duration_sec": 31,
+        "top_signals": "temp_c:+5.0",
+        "event_hint": "THERMAL",
+        "severity_score": [10.0 + i for i in range(n)],
+    })
+
+
+def _rca(n: int) -> pd.DataFrame:
+    return pd.DataFrame({
+        "incident_id": [f"INC_{i:04d}" for i in range(n)],
+        "root_cause": "Thermal throttling / power management",
+        "confidence": 0.7,
+    })
+
+
+def test_latest_counts_each_source_once(tmp_path):
+    store = IncidentStore(tmp_path / "incidents.db")
+    store.append(_incidents(3), _rca(3), source="data/a")
+    rerun = store.append(_incidents(3), _rca(3), source="data/a")
+    store.append(_incidents(2), _rca(2), source="data/b")
+
+    assert store.count() == 8
+    assert store.count(latest=True) == 5
+    latest = store.query(latest=True, host="host_00")
+    assert rerun in set(latest["run_id"])
+    assert len(latest) == 2  # one per source
+    counts = store.root_cause_counts(latest=True)
+    assert counts["count"].tolist() == [5]
+
+
+def test_filters_use_time_range_and_severity(tmp_path):
+    store = IncidentStore(tmp_path / "incidents.db")
+    store.append(_incidents(5), _rca(5), source="data/a")
+
+    assert store.count(since="2026-01-28 17:02", until="2026-01-28 17:04") == 2
+    top = store.query(min_severity=13, limit=1)
+    assert top["incident_id"].tolist() == ["INC_0004"]